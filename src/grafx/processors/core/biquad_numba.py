@@ -0,0 +1,51 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def biquad_cascade(x, Bs, As, clamp=True):
+    r"""
+    Applies a serial stack of biquads to each signal with the transposed direct form II.
+    Mirroring :python:`torchaudio.functional.lfilter`, the coefficients are normalized by $a_{i, 0}$
+    and each biquad's output is clamped to $[-1, 1]$ if :python:`clamp` is :python:`True`.
+    The signals are processed in parallel.
+    The filter states are kept in the input precision, but the transposed direct form II
+    (compiled with :python:`fastmath`) rounds differently from :python:`lfilter`,
+    so single-precision outputs agree with it only up to rounding errors.
+
+    Args:
+        x (:python:`ndarray`, :math:`N \times L`):
+            A stack of input signals.
+        Bs (:python:`ndarray`, :math:`N \times K \times 3`):
+            Numerator coefficients of the biquads.
+        As (:python:`ndarray`, :math:`N \times K \times 3`):
+            Denominator coefficients of the biquads.
+        clamp (:python:`bool`, *optional*):
+            Whether to clamp each biquad's output (default: :python:`True`).
+
+    Returns:
+        :python:`ndarray`: A stack of output signals of shape :math:`N \times L`.
+    """
+    num_signals, signal_len = x.shape
+    num_biquads = Bs.shape[1]
+    y = np.empty_like(x)
+    # keep the filter states in the input precision, as lfilter does.
+    zero = np.zeros(1, dtype=x.dtype)[0]
+
+    for i in prange(num_signals):
+        y[i] = x[i]
+        for k in range(num_biquads):
+            a0 = As[i, k, 0]
+            b0, b1, b2 = Bs[i, k, 0] / a0, Bs[i, k, 1] / a0, Bs[i, k, 2] / a0
+            a1, a2 = As[i, k, 1] / a0, As[i, k, 2] / a0
+
+            s1, s2 = zero, zero
+            for n in range(signal_len):
+                u = y[i, n]
+                v = b0 * u + s1
+                s1 = b1 * u - a1 * v + s2
+                s2 = b2 * u - a2 * v
+                if clamp:
+                    v = min(max(v, -1.0), 1.0)
+                y[i, n] = v
+    return y
@@ -106,24 +106,41 @@ class FIRConvolution(nn.Module):
         return y
 
 
+def next_fast_len(n):
+    r"""
+    Returns the smallest integer $\geq n$ whose prime factors are only 2, 3, and 5,
+    which the FFT backends (pocketfft, cuFFT) handle efficiently.
+    """
+    while True:
+        m = n
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
 def compute_pad_len(x, y, pad_mode="pow2"):
     pad_len = x.shape[-1] + y.shape[-1] - 1
     match pad_mode:
         case "pow2":
             pad_len_log2 = np.ceil(np.log2(pad_len))
-            pad_len = int(2**pad_len_log2)
+            return int(2**pad_len_log2)
+        case "fast":
+            return next_fast_len(pad_len)
         case "min":
             return pad_len
+        case _:
+            raise ValueError(f"Unsupported pad_mode: {pad_mode}")
 
 
 def convolve(x, h, mode="zerophase", pad_mode="min"):
     pad_len = compute_pad_len(x, h, pad_mode)
-    x_pad = F.pad(x, (0, pad_len - x.shape[-1]))
-    h_pad = F.pad(h, (0, pad_len - h.shape[-1]))
-    X_PAD = torch.fft.rfft(x_pad)
-    H_PAD = torch.fft.rfft(h_pad)
+    X_PAD = torch.fft.rfft(x, n=pad_len)
+    H_PAD = torch.fft.rfft(h, n=pad_len)
     Y_PAD = X_PAD * H_PAD
-    y_pad = torch.fft.irfft(Y_PAD)
+    y_pad = torch.fft.irfft(Y_PAD, n=pad_len)
     match mode:
         case "zerophase":
             y = y_pad[..., h.shape[-1] // 2 : h.shape[-1] // 2 + x.shape[-1]]
@@ -132,3 +149,63 @@ def convolve(x, h, mode="zerophase", pad_mode="min"):
         case _:
             y = y_pad
     return y
+
+
+def zerophase_magnitude_convolve(x, magnitude, fir_len, window_taps=None):
+    r"""
+    Applies a zero-phase filter given by its magnitude response directly in the frequency domain.
+
+        The magnitude $H[k]$, sampled at $N$-point DFT bins (:python:`fir_len` $= N$),
+        is linearly interpolated to the $M$-point DFT grid of the zero-padded input
+        and multiplied with its spectrum; the filter design IFFT and the kernel FFT are skipped.
+        A cosine-sum window is approximated on the $N$-point grid, before the interpolation,
+        as a short symmetric convolution $\sum_j c_j (H[k-j] + H[k+j])$ with its taps $c_j$;
+        the taps assume a window centered on the FIR, which torch's periodic windows are only up to half a sample.
+        Linear interpolation also tapers the implied impulse response with $\mathrm{sinc}^2(n/N)$,
+        so this only approximates the windowed FIR of :func:`convolve`.
+
+    Args:
+        x (:python:`FloatTensor`, :math:`B \times C_\mathrm{in} \times L`):
+            A batch of input audio signals.
+        magnitude (:python:`FloatTensor`, :math:`B \times C_\mathrm{filter} \times K`):
+            A batch of (linear) magnitude responses.
+        fir_len (:python:`int`):
+            The FIR length $N$ that the magnitude bins are sampled for.
+        window_taps (:python:`FloatTensor`, *optional*):
+            Window taps $[c_0, c_1, \cdots]$ (see :func:`~grafx.processors.core.fir.get_window_taps`).
+            If :python:`None`, no window is applied (default: :python:`None`).
+
+    Returns:
+        :python:`FloatTensor`: A batch of filtered signals of shape :math:`B \times C_\mathrm{out} \times L`.
+    """
+    signal_len, num_bins = x.shape[-1], magnitude.shape[-1]
+    pad_len = next_fast_len(signal_len + fir_len - 1)
+
+    if window_taps is not None:
+        num_taps = len(window_taps) - 1
+        # a zero-phase response is even and, for odd fir_len, H[N - k] = H[k].
+        padded = torch.cat(
+            [
+                magnitude[..., 1 : num_taps + 1].flip(-1),
+                magnitude,
+                magnitude[..., num_bins - num_taps :].flip(-1),
+            ],
+            dim=-1,
+        )
+        smoothed = window_taps[0] * magnitude
+        for j in range(1, num_taps + 1):
+            left = padded[..., num_taps - j : num_taps - j + num_bins]
+            right = padded[..., num_taps + j : num_taps + j + num_bins]
+            smoothed = smoothed + window_taps[j] * (left + right)
+        magnitude = smoothed
+
+    position = torch.arange(pad_len // 2 + 1, device=x.device) * (fir_len / pad_len)
+    position = position.clamp(max=num_bins - 1)
+    lower = position.long()
+    upper = (lower + 1).clamp(max=num_bins - 1)
+    frac = (position - lower).to(magnitude.dtype)
+    magnitude = magnitude[..., lower] * (1 - frac) + magnitude[..., upper] * frac
+
+    X_PAD = torch.fft.rfft(x, n=pad_len)
+    y_pad = torch.fft.irfft(X_PAD * magnitude, n=pad_len)
+    return y_pad[..., :signal_len]
@@ -22,6 +22,27 @@ def get_window(window_type, window_length, **kwargs):
             raise ValueError(f"Unsupported window type: {window_type}")
 
 
+def get_window_taps(window_type, **kwargs):
+    r"""
+    Returns the frequency-domain taps $[c_0, c_1, \cdots]$ of a zero-centered cosine-sum window,
+    i.e., multiplying a zero-phase FIR with the window approximately equals convolving its DFT magnitude
+    with the symmetric kernel $[\cdots, c_1, c_0, c_1, \cdots]$.
+    The taps ignore the half-sample offset of periodic windows and options other than Hamming's
+    :python:`alpha` and :python:`beta`.
+    Returns :python:`None` for the other windows, whose transforms are not sparse.
+    """
+    match window_type:
+        case "hann":
+            return torch.tensor([0.5, 0.25])
+        case "hamming":
+            alpha, beta = kwargs.get("alpha", 0.54), kwargs.get("beta", 0.46)
+            return torch.tensor([alpha, beta / 2])
+        case "blackman":
+            return torch.tensor([0.42, 0.25, 0.04])
+        case _:
+            return None
+
+
 def log_magnitude_to_zerophase_fir(
     log_magnitude,
     fir_len,
@@ -55,6 +76,12 @@ class ZeroPhaseFIR(nn.Module):
         self.num_magnitude_bins = num_magnitude_bins
         self.fir_len = 2 * num_magnitude_bins - 1
 
+        # the window's spectral taps, used by the frequency-domain path.
+        window_taps = None
+        if not isinstance(window, torch.Tensor):
+            window_taps = get_window_taps(window, **window_kwargs)
+        self.register_buffer("window_taps", window_taps, persistent=False)
+
         if isinstance(window, torch.Tensor):
             self.register_buffer("window", window)
         else:
@@ -94,6 +121,18 @@ class ZeroPhaseFilterBankFIR(nn.Module):
             self.filterbank = TriangularFilterBank(
                 num_frequency_bins=num_frequency_bins, **filterbank_kwargs
             )
+            # the triangular filterbank has only a few nonzeros per frequency bin,
+            # so we store it as (row, col, weight) triplets instead of a dense matmul.
+            matrix = self.filterbank.filterbank.T
+            fb_rows, fb_cols = matrix.nonzero(as_tuple=True)
+            self.register_buffer("fb_rows", fb_rows, persistent=False)
+            self.register_buffer("fb_cols", fb_cols, persistent=False)
+            self.register_buffer("fb_w", matrix[fb_rows, fb_cols], persistent=False)
+
+        window_taps = None
+        if not isinstance(window, torch.Tensor):
+            window_taps = get_window_taps(window, **window_kwargs)
+        self.register_buffer("window_taps", window_taps, persistent=False)
 
         if isinstance(window, torch.Tensor):
             self.register_buffer("window", window)
@@ -104,15 +143,10 @@ class ZeroPhaseFilterBankFIR(nn.Module):
             self.register_buffer("window", window)
 
     def forward(self, log_magnitude):
-        shape = log_magnitude.shape
-        shape, f = shape[:-1], shape[-1]
-        log_magnitude = log_magnitude.view(-1, f)
+        shape = log_magnitude.shape[:-1]
+        magnitude = self.magnitude(log_magnitude)
+        magnitude = magnitude.view(-1, magnitude.shape[-1])
 
-        magnitude = torch.exp(log_magnitude)
-        if self.use_filterbank:
-            energy = magnitude.square()
-            energy = self.filterbank(energy)
-            magnitude = torch.sqrt(energy + self.eps)
         ir = torch.fft.irfft(magnitude, n=self.fir_len)
         shifts = self.fir_len // 2
         ir = torch.roll(ir, shifts=shifts, dims=-1)
@@ -121,3 +155,22 @@ class ZeroPhaseFilterBankFIR(nn.Module):
 
         ir = ir.view(*shape, -1)
         return ir
+
+    def magnitude(self, log_magnitude):
+        r"""
+        Returns the linear FFT magnitudes (expanded with the filterbank if used) without the FIR design.
+        """
+        shape = log_magnitude.shape
+        shape, f = shape[:-1], shape[-1]
+        log_magnitude = log_magnitude.view(-1, f)
+
+        magnitude = torch.exp(log_magnitude)
+        if self.use_filterbank:
+            energy = magnitude.square()
+            energy = energy.new_zeros(
+                energy.shape[0], self.num_frequency_bins
+            ).index_add(-1, self.fb_rows, energy[:, self.fb_cols] * self.fb_w)
+            magnitude = torch.sqrt(energy + self.eps)
+
+        magnitude = magnitude.view(*shape, -1)
+        return magnitude
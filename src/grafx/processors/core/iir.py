@@ -11,6 +11,13 @@ from torchaudio.functional import lfilter
 from grafx.processors.core.convolution import FIRConvolution
 from grafx.processors.core.midside import lr_to_ms, ms_to_lr
 
+try:
+    from grafx.processors.core.biquad_numba import biquad_cascade
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 TORCHAUDIO_VERSION = torchaudio.__version__
 
 
@@ -38,6 +45,10 @@ class IIRFilter(nn.Module):
         y_i[n] &= x[n] - \bar{a}_{i, 1} y[n-1] - \bar{a}_{i, 2} y[n-2]
         $$
 
+        Optionally (:python:`use_numba=True`), CPU inference (no gradient recorded) computes the cascade
+        with a parallel :python:`numba` kernel in the transposed direct form II instead.
+        Its single-precision outputs differ from :python:`torchaudio.lfilter` by rounding errors.
+
         The second one, :python:`"fsm"`, is the frequency-sampling method (FSM) that approximates the filter with a finite impulse response (FIR)
         by sampling the discrete-time Fourier transform (DTFT) of the filter $H(e^{j\omega})$ at a finite number of points $N$ uniformly 
         :cite:`rabiner70freqsamp, kuznetsov2020differentiable`.
@@ -70,6 +81,9 @@ class IIRFilter(nn.Module):
             :python:`"fsm"` or exact time-domain filter :python:`"lfilter"` (default: :python:`"fsm"`).
         fsm_fir_len (:python:`int`, *optional*):
             The length of FIR approximation when :python:`backend == "fsm"` (default: :python:`8192`).
+        use_numba (:python:`bool`, *optional*):
+            If :python:`True` and :python:`backend == "lfilter"`, use the :python:`numba` kernel
+            for CPU inference (default: :python:`False`).
     """
 
     def __init__(
@@ -80,9 +94,15 @@ class IIRFilter(nn.Module):
         fsm_fir_len=4000,
         fsm_max_input_len=2**17,
         fsm_regularization=False,
+        use_numba=False,
     ):
         super().__init__()
         self.backend = backend
+
+        if not NUMBA_AVAILABLE and use_numba:
+            warnings.warn("numba is not available. Using torchaudio.lfilter instead.")
+            use_numba = False
+        self.use_numba = use_numba
         self.fsm_fir_len = fsm_fir_len
         self.fsm_regularization = fsm_regularization
 
@@ -147,18 +167,33 @@ class IIRFilter(nn.Module):
         Bs = Bs.view(b * c, num_biquads, 3)
         As = As.view(b * c, num_biquads, 3)
 
-        output_signal = input_signal
-        num_filters = Bs.shape[-2]
-        for i in range(num_filters):
-            output_signal = lfilter(
-                output_signal,
-                b_coeffs=Bs[:, i, :],
-                a_coeffs=As[:, i, :],
-                batching=True,
-            )
+        if self._use_numba_lfilter(input_signal, Bs, As):
+            output_signal = biquad_cascade(input_signal.numpy(), Bs.numpy(), As.numpy())
+            output_signal = torch.from_numpy(output_signal)
+        else:
+            output_signal = input_signal
+            num_filters = Bs.shape[-2]
+            for i in range(num_filters):
+                output_signal = lfilter(
+                    output_signal,
+                    b_coeffs=Bs[:, i, :],
+                    a_coeffs=As[:, i, :],
+                    batching=True,
+                )
         output_signal = output_signal.view(b, c, audio_len)
         return output_signal
 
+    def _use_numba_lfilter(self, input_signal, Bs, As):
+        # the numba kernel has no autograd support; only use it for cpu inference.
+        if not self.use_numba:
+            return False
+        tensors = (input_signal, Bs, As)
+        if any(t.device.type != "cpu" for t in tensors):
+            return False
+        if torch.is_grad_enabled() and any(t.requires_grad for t in tensors):
+            return False
+        return input_signal.dtype == Bs.dtype == As.dtype
+
     @staticmethod
     def iir_fsm(Bs, As, delays, eps=1e-10):
         Bs, As = Bs.unsqueeze(-1), As.unsqueeze(-1)
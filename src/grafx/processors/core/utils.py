@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 import torch
 import torch.fft
@@ -16,3 +18,23 @@ def normalize_impulse(ir, eps=1e-12):
     e = ir.square().sum(2, keepdim=True).mean(1, keepdim=True)
     ir = ir / torch.sqrt(e + eps)
     return ir
+
+
+@lru_cache(maxsize=None)
+def compile_function(function):
+    # compiled once per function and kept at module level, so modules stay picklable
+    return torch.compile(function, dynamic=True)
+
+
+def cast_tensors(dtype, *tensors):
+    if dtype is None:
+        return tensors
+    return tuple(None if x is None else x.to(dtype) for x in tensors)
+
+
+def remove_dc_and_scale(x, remove_dc=False, gain=None):
+    # (x - mean(x)) * gain; subtracting first avoids cancellation between x * gain and dc * gain.
+    # call it before casting to a lower precision, which would round away small ac parts.
+    if remove_dc:
+        x = x - x.mean(-1, keepdim=True)
+    return x if gain is None else x * gain
@@ -3,7 +3,7 @@ import math
 import torch
 import torch.nn as nn
 
-from grafx.processors.core.convolution import convolve
+from grafx.processors.core.convolution import convolve, zerophase_magnitude_convolve
 from grafx.processors.core.fir import ZeroPhaseFilterBankFIR, ZeroPhaseFIR
 from grafx.processors.core.geq import GraphicEqualizerBiquad
 from grafx.processors.core.iir import IIRFilter
@@ -68,9 +68,38 @@ class ZeroPhaseFIREqualizer(nn.Module):
             :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
         """
         fir = self.fir(log_magnitude)[:, None, :]
-        output_signals = convolve(input_signals, fir, mode="zerophase")
+        output_signals = convolve(input_signals, fir, mode="zerophase", pad_mode="fast")
         return output_signals
 
+    def forward_freq(self, input_signals, log_magnitude):
+        r"""
+        Processes input audio in the frequency domain, skipping the FIR design.
+        The magnitude response is applied directly to the input spectrum
+        (see :func:`~grafx.processors.core.convolution.zerophase_magnitude_convolve`),
+        which approximates :python:`forward`.
+        Windows without spectral taps (see :func:`~grafx.processors.core.fir.get_window_taps`),
+        e.g., :python:`"kaiser"` or a custom window tensor, cannot be applied this way,
+        so we fall back to :python:`forward` for them.
+
+        Args:
+            input_signals (:python:`FloatTensor`, :math:`B \times C \times L`):
+                A batch of input audio signals.
+            log_magnitude (:python:`FloatTensor`, :math:`B \times K \:\!`):
+                A batch of log-magnitude vectors of the FIR filter.
+
+        Returns:
+            :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
+        """
+        if self.fir.window is not None and self.fir.window_taps is None:
+            return self.forward(input_signals, log_magnitude)
+        magnitude = torch.exp(log_magnitude)[:, None, :]
+        return zerophase_magnitude_convolve(
+            input_signals,
+            magnitude,
+            fir_len=self.fir.fir_len,
+            window_taps=self.fir.window_taps,
+        )
+
     def parameter_size(self):
         r"""
         Returns:
@@ -168,6 +197,15 @@ class NewZeroPhaseFIREqualizer(nn.Module):
                 self.process = self._process_mono_stereo
             case "midside":
                 self.process = self._process_midside
+                # same as lr_to_ms and ms_to_lr, applied with a single matmul each
+                lr_to_ms_matrix = torch.tensor([[0.5, 0.5], [0.5, -0.5]])
+                ms_to_lr_matrix = torch.tensor([[1.0, 1.0], [1.0, -1.0]])
+                self.register_buffer(
+                    "lr_to_ms_matrix", lr_to_ms_matrix, persistent=False
+                )
+                self.register_buffer(
+                    "ms_to_lr_matrix", ms_to_lr_matrix, persistent=False
+                )
             case _:
                 raise ValueError(f"Invalid processor_channel: {self.processor_channel}")
 
@@ -188,6 +226,44 @@ class NewZeroPhaseFIREqualizer(nn.Module):
         output_signals = self.process(input_signals, fir)
         return output_signals
 
+    def forward_freq(self, input_signals, log_magnitude):
+        r"""
+        Processes input audio in the frequency domain, skipping the FIR design.
+        The magnitude response is applied directly to the input spectrum
+        (see :func:`~grafx.processors.core.convolution.zerophase_magnitude_convolve`),
+        which approximates :python:`forward`.
+        Windows without spectral taps (see :func:`~grafx.processors.core.fir.get_window_taps`),
+        e.g., :python:`"kaiser"` or a custom window tensor, cannot be applied this way,
+        so we fall back to :python:`forward` for them.
+
+        Args:
+            input_signals (:python:`FloatTensor`, :math:`B \times C \times L`):
+                A batch of input audio signals.
+            log_magnitude (:python:`FloatTensor`, :math:`B \times C_\mathrm{eq} \times K` *or* :math:`B \times C_\mathrm{eq} \times K_\mathrm{fb}`):
+                A batch of log-magnitude vectors of the FIR filter.
+
+        Returns:
+            :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
+        """
+        if self.fir.window is not None and self.fir.window_taps is None:
+            return self.forward(input_signals, log_magnitude)
+        magnitude = self.fir.magnitude(log_magnitude)
+        if self.processor_channel == "midside":
+            input_signals = torch.matmul(
+                self.lr_to_ms_matrix.to(input_signals.dtype), input_signals
+            )
+        output_signals = zerophase_magnitude_convolve(
+            input_signals,
+            magnitude,
+            fir_len=self.fir.fir_len,
+            window_taps=self.fir.window_taps,
+        )
+        if self.processor_channel == "midside":
+            output_signals = torch.matmul(
+                self.ms_to_lr_matrix.to(output_signals.dtype), output_signals
+            )
+        return output_signals
+
     def parameter_size(self):
         r"""
         Returns:
@@ -206,12 +282,16 @@ class NewZeroPhaseFIREqualizer(nn.Module):
         return {"log_magnitude": (n_channels, n_bins)}
 
     def _process_mono_stereo(self, input_signals, fir):
-        return convolve(input_signals, fir, mode="zerophase")
+        return convolve(input_signals, fir, mode="zerophase", pad_mode="fast")
 
     def _process_midside(self, input_signals, fir):
-        input_signals = lr_to_ms(input_signals)
-        output_signals = convolve(input_signals, fir, mode="zerophase")
-        return ms_to_lr(output_signals)
+        input_signals = torch.matmul(
+            self.lr_to_ms_matrix.to(input_signals.dtype), input_signals
+        )
+        output_signals = convolve(input_signals, fir, mode="zerophase", pad_mode="fast")
+        return torch.matmul(
+            self.ms_to_lr_matrix.to(output_signals.dtype), output_signals
+        )
 
 
 class ParametricEqualizer(nn.Module):
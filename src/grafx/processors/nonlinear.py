@@ -1,7 +1,15 @@
+import math
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
+from grafx.processors.core.utils import (
+    cast_tensors,
+    compile_function,
+    remove_dc_and_scale,
+)
+
 
 class TanhDistortion(nn.Module):
     r"""
@@ -38,7 +46,11 @@ class TanhDistortion(nn.Module):
         use_bias (:python:`bool`, *optional*):
             If :python:`True`, we apply the bias term
             (default: :python:`False`).
-
+        compute_dtype (:python:`torch.dtype`, *optional*):
+            If given (e.g., :python:`torch.bfloat16`), the input signals and parameters are cast to this dtype
+            for the nonlinearity and the output is cast back to the input dtype.
+            The DC removal and pre-gain are applied before the cast, in the input precision
+            (default: :python:`None`).
     """
 
     def __init__(
@@ -47,12 +59,14 @@ class TanhDistortion(nn.Module):
         inverse_post_gain=True,
         remove_dc=False,
         use_bias=False,
+        compute_dtype=None,
     ):
         super().__init__()
         self.pre_post_gain = pre_post_gain
         self.inverse_post_gain = inverse_post_gain
         self.remove_dc = remove_dc
         self.use_bias = use_bias
+        self.compute_dtype = compute_dtype
 
     def forward(self, input_signals, log_pre_gain=None, log_post_gain=None, bias=None):
         r"""
@@ -76,12 +90,14 @@ class TanhDistortion(nn.Module):
         Returns:
             :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
         """
-        if self.remove_dc:
-            input_signals = input_signals - input_signals.mean(-1, keepdims=True)
-
+        dtype = input_signals.dtype
+        pre_gain = None
         if self.pre_post_gain:
             pre_gain = torch.exp(log_pre_gain).unsqueeze(-1)
-            input_signals = input_signals * pre_gain
+        input_signals = remove_dc_and_scale(input_signals, self.remove_dc, pre_gain)
+        input_signals, log_pre_gain, log_post_gain, bias = cast_tensors(
+            self.compute_dtype, input_signals, log_pre_gain, log_post_gain, bias
+        )
 
         if self.use_bias:
             bias = bias.unsqueeze(-1)
@@ -91,11 +107,11 @@ class TanhDistortion(nn.Module):
 
         if self.pre_post_gain:
             if self.inverse_post_gain:
-                post_gain = 1 / pre_gain
+                post_gain = torch.exp(-log_pre_gain).unsqueeze(-1)
             else:
                 post_gain = torch.exp(log_post_gain).unsqueeze(-1)
             output_signals = output_signals * post_gain
-        return output_signals
+        return output_signals.to(dtype)
 
     def parameter_size(self):
         r"""
@@ -140,14 +156,42 @@ class PiecewiseTanhDistortion(nn.Module):
         $\smash{h_p = \exp \tilde{h}_p}$, and 
         $\smash{h_n = \exp \tilde{h}_n}$.
 
-        
+    Args:
+        pre_post_gain (:python:`bool`, *optional*):
+            If :python:`True`, we apply the pre- and post-gain
+            (default: :python:`True`).
+        inverse_post_gain (:python:`bool`, *optional*):
+            If :python:`True`, we set the post-gain as an inverse of the pre-gain
+            (default: :python:`True`).
+        remove_dc (:python:`bool`, *optional*):
+            If :python:`True`, we pre-process the input signal to remove the DC component
+            (default: :python:`False`).
+        torch_compile (:python:`bool`, *optional*):
+            If :python:`True`, we compile the elementwise nonlinearity with :python:`torch.compile`
+            so that it runs as a single fused kernel
+            (default: :python:`False`).
+        compute_dtype (:python:`torch.dtype`, *optional*):
+            If given (e.g., :python:`torch.bfloat16`), the input signals and parameters are cast to this dtype
+            for the nonlinearity and the output is cast back to the input dtype.
+            The DC removal and pre-gain are applied before the cast, in the input precision
+            (default: :python:`None`).
     """
 
-    def __init__(self, pre_post_gain=True, inverse_post_gain=True, remove_dc=False):
+    def __init__(
+        self,
+        pre_post_gain=True,
+        inverse_post_gain=True,
+        remove_dc=False,
+        torch_compile=False,
+        compute_dtype=None,
+    ):
         super().__init__()
         self.pre_post_gain = pre_post_gain
         self.inverse_post_gain = inverse_post_gain
         self.remove_dc = remove_dc
+        self.compute_dtype = compute_dtype
+        self._cached_coefficients = None
+        self.torch_compile = torch_compile
 
     def forward(
         self,
@@ -178,47 +222,88 @@ class PiecewiseTanhDistortion(nn.Module):
         Returns:
             :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
         """
-        if self.remove_dc:
-            input_signals = input_signals - input_signals.mean(-1, keepdims=True)
-
+        dtype = input_signals.dtype
+        coefficients = self.get_coefficients(log_hardness, z_threshold)
+        pre_gain = None
         if self.pre_post_gain:
             pre_gain = torch.exp(log_pre_gain).unsqueeze(-1)
-            input_signals = input_signals * pre_gain
-
-        hardness = torch.exp(log_hardness)
-        threshold = torch.sigmoid(z_threshold)
+        input_signals = remove_dc_and_scale(input_signals, self.remove_dc, pre_gain)
+        input_signals, log_pre_gain, log_post_gain = cast_tensors(
+            self.compute_dtype, input_signals, log_pre_gain, log_post_gain
+        )
 
-        output_signals = self.apply_distortion(input_signals, hardness, threshold)
+        apply_distortion = self.apply_distortion
+        if self.torch_compile:
+            apply_distortion = compile_function(apply_distortion)
+        output_signals = apply_distortion(input_signals, *coefficients)
 
         if self.pre_post_gain:
             if self.inverse_post_gain:
-                post_gain = 1 / pre_gain
+                post_gain = torch.exp(-log_pre_gain).unsqueeze(-1)
             else:
                 post_gain = torch.exp(log_post_gain).unsqueeze(-1)
             output_signals = output_signals * post_gain
-        return output_signals
+        return output_signals.to(dtype)
+
+    def get_coefficients(self, log_hardness, z_threshold):
+        r"""
+        Computes the segment coefficients $(k_p, k_n, h_p, h_n, a_p, a_n, b_p, b_n)$.
+        In eval mode, when the same parameter tensors are given again without any in-place modification
+        and no gradient is being recorded, the previously computed coefficients are reused.
+        Inference tensors have no version counter, so they are never cached.
+        """
+        tensors = (log_hardness, z_threshold)
+        use_cache = not self.training
+        use_cache = use_cache and not any(t.is_inference() for t in tensors)
+        use_cache = use_cache and not (
+            torch.is_grad_enabled() and any(t.requires_grad for t in tensors)
+        )
+
+        if use_cache:
+            key = (*tensors, *(t._version for t in tensors))
+            if self._cached_coefficients is not None:
+                cached_key, coefficients = self._cached_coefficients
+                if (
+                    cached_key[0] is key[0]
+                    and cached_key[1] is key[1]
+                    and cached_key[2:] == key[2:]
+                ):
+                    return coefficients
+
+        log_hardness, z_threshold = cast_tensors(
+            self.compute_dtype, log_hardness, z_threshold
+        )
+        hardness = torch.exp(log_hardness)
+        threshold = torch.sigmoid(z_threshold)
+        coefficients = self.compute_coefficients(hardness, threshold)
+
+        # the key holds the parameter tensors, so their memory cannot be reused for other tensors.
+        self._cached_coefficients = (key, coefficients) if use_cache else None
+        return coefficients
 
     @staticmethod
-    def apply_distortion(input_signals, hardness, threshold):
+    def compute_coefficients(hardness, threshold):
         hardness, threshold = hardness.unsqueeze(-2), threshold.unsqueeze(-2)
 
         kn, kp = threshold.split(1, dim=-1)
         gp, gn = hardness.split(1, dim=-1)
 
-        ap, an = (1 - torch.tanh(kp)) / gp, (1 - torch.tanh(kn)) / gn
-        bp, bn = torch.tanh(kp), -torch.tanh(kn)
-
-        output_signals = torch.zeros_like(input_signals)
-
-        above_mask = input_signals > kp
-        below_mask = input_signals < -kn
-        middle_mask = ~above_mask & ~below_mask
+        tanh_kp, tanh_kn = torch.tanh(kp), torch.tanh(kn)
+        ap, an = (1 - tanh_kp * tanh_kp) / gp, (1 - tanh_kn * tanh_kn) / gn
+        bp, bn = tanh_kp, -tanh_kn
+        return kp, kn, gp, gn, ap, an, bp, bn
 
+    @staticmethod
+    def apply_distortion(input_signals, kp, kn, gp, gn, ap, an, bp, bn):
         above = ap * torch.tanh(gp * (input_signals - kp)) + bp
         middle = torch.tanh(input_signals)
         below = an * torch.tanh(gn * (input_signals + kn)) + bn
 
-        output_signals = above_mask * above + middle_mask * middle + below_mask * below
+        output_signals = torch.where(
+            input_signals > kp,
+            above,
+            torch.where(input_signals < -kn, below, middle),
+        )
         return output_signals
 
     def parameter_size(self):
@@ -253,9 +338,34 @@ class PowerDistortion(nn.Module):
 
         The processor has parameters of $p = \{\mathbf{w}, \tilde{\mathbf{g}}_{\mathrm{pre}}\}$,
         where the former is a stack of the coefficients and the latter is the optional log pre-gain values.
+
+    Args:
+        max_order (:python:`int`, *optional*):
+            The number of polynomial coefficients $K$ (default: :python:`10`).
+        pre_gain (:python:`bool`, *optional*):
+            If :python:`True`, we apply the pre-gain
+            (default: :python:`True`).
+        remove_dc (:python:`bool`, *optional*):
+            If :python:`True`, we pre-process the input signal to remove the DC component
+            (default: :python:`False`).
+        use_tanh (:python:`bool`, *optional*):
+            If :python:`True`, we apply the hyperbolic tangent to each power
+            (default: :python:`False`).
+        compute_dtype (:python:`torch.dtype`, *optional*):
+            If given (e.g., :python:`torch.bfloat16`), the input signals and parameters are cast to this dtype
+            for the nonlinearity and the output is cast back to the input dtype.
+            The DC removal and pre-gain are applied before the cast, in the input precision
+            (default: :python:`None`).
     """
 
-    def __init__(self, max_order=10, pre_gain=True, remove_dc=False, use_tanh=False):
+    def __init__(
+        self,
+        max_order=10,
+        pre_gain=True,
+        remove_dc=False,
+        use_tanh=False,
+        compute_dtype=None,
+    ):
         super().__init__()
 
         assert max_order > 1
@@ -264,10 +374,7 @@ class PowerDistortion(nn.Module):
         self.max_order = max_order
         self.remove_dc = remove_dc
         self.use_tanh = use_tanh
-
-        arange = torch.arange(self.max_order)
-        arange = arange[:, None, None, None]
-        self.register_buffer("arange", arange)
+        self.compute_dtype = compute_dtype
 
     def forward(self, input_signals, basis_weights, log_pre_gain=None):
         r"""
@@ -285,21 +392,40 @@ class PowerDistortion(nn.Module):
         Returns:
             :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
         """
-        if self.remove_dc:
-            input_signals = input_signals - input_signals.mean(-1, keepdims=True)
-
+        dtype = input_signals.dtype
+        pre_gain = None
         if self.pre_gain:
             pre_gain = torch.exp(log_pre_gain).unsqueeze(-1)
-            input_signals = input_signals * pre_gain
+        input_signals = remove_dc_and_scale(input_signals, self.remove_dc, pre_gain)
+        input_signals, basis_weights = cast_tensors(
+            self.compute_dtype, input_signals, basis_weights
+        )
 
         basis_weights = torch.tanh(basis_weights)
-        basis_weights = basis_weights.T[:, :, None, None]
+        basis_weights = basis_weights[:, :, None, None]
 
-        powers = torch.pow(input_signals.unsqueeze(0), self.arange)
         if self.use_tanh:
-            powers = torch.tanh(powers)
-        output_signals = (powers * basis_weights).sum(0)
-        return output_signals
+            # the accumulator is not saved for backward, so we can update it in-place
+            u_k = input_signals
+            output_signals = torch.addcmul(
+                math.tanh(1) * basis_weights[:, 0], basis_weights[:, 1], torch.tanh(u_k)
+            )
+            for k in range(2, self.max_order):
+                u_k = u_k * input_signals
+                output_signals.addcmul_(basis_weights[:, k], torch.tanh(u_k))
+        else:
+            # horner's method; avoids stacking all powers
+            output_signals = basis_weights[:, -1]
+            for k in reversed(range(self.max_order - 1)):
+                output_signals = torch.addcmul(
+                    basis_weights[:, k], output_signals, input_signals
+                )
+        return output_signals.to(dtype)
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # older checkpoints carry the exponents as an "arange" buffer, unused by horner's method.
+        state_dict.pop(prefix + "arange", None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     def parameter_size(self):
         r"""
@@ -339,9 +465,39 @@ class ChebyshevDistortion(nn.Module):
 
         The processor has parameters of $p = \{\mathbf{w}, \tilde{\mathbf{g}}_{\mathrm{pre}}\}$,
         where the latter is optional.
+
+    Args:
+        max_order (:python:`int`, *optional*):
+            The number of Chebyshev polynomials $K$ (default: :python:`10`).
+        pre_gain (:python:`bool`, *optional*):
+            If :python:`True`, we apply the pre-gain
+            (default: :python:`True`).
+        remove_dc (:python:`bool`, *optional*):
+            If :python:`True`, we pre-process the input signal to remove the DC component
+            (default: :python:`False`).
+        use_tanh (:python:`bool`, *optional*):
+            If :python:`True`, we apply the hyperbolic tangent to each polynomial
+            (default: :python:`False`).
+        torch_compile (:python:`bool`, *optional*):
+            If :python:`True`, we compile the polynomial recurrence with :python:`torch.compile`
+            so that it runs as a single fused kernel
+            (default: :python:`False`).
+        compute_dtype (:python:`torch.dtype`, *optional*):
+            If given (e.g., :python:`torch.bfloat16`), the input signals and parameters are cast to this dtype
+            for the nonlinearity and the output is cast back to the input dtype.
+            The DC removal and pre-gain are applied before the cast, in the input precision
+            (default: :python:`None`).
     """
 
-    def __init__(self, max_order=10, pre_gain=True, remove_dc=False, use_tanh=False):
+    def __init__(
+        self,
+        max_order=10,
+        pre_gain=True,
+        remove_dc=False,
+        use_tanh=False,
+        torch_compile=False,
+        compute_dtype=None,
+    ):
         super().__init__()
 
         assert max_order > 1
@@ -350,6 +506,8 @@ class ChebyshevDistortion(nn.Module):
         self.max_order = max_order
         self.remove_dc = remove_dc
         self.use_tanh = use_tanh
+        self.compute_dtype = compute_dtype
+        self.torch_compile = torch_compile
 
     def forward(self, input_signals, basis_weights, log_pre_gain=None):
         r"""
@@ -368,38 +526,41 @@ class ChebyshevDistortion(nn.Module):
         Returns:
             :python:`FloatTensor`: A batch of output signals of shape :math:`B \times C \times L`.
         """
-        if self.remove_dc:
-            input_signals = input_signals - input_signals.mean(-1, keepdims=True)
-
+        dtype = input_signals.dtype
+        pre_gain = None
         if self.pre_gain:
             pre_gain = torch.exp(log_pre_gain).unsqueeze(-1)
-            input_signals = input_signals * pre_gain
+        input_signals = remove_dc_and_scale(input_signals, self.remove_dc, pre_gain)
+        input_signals, basis_weights = cast_tensors(
+            self.compute_dtype, input_signals, basis_weights
+        )
 
         basis_weights = torch.tanh(basis_weights)
-        output_signals = self.apply_distortion(
-            input_signals, basis_weights, self.use_tanh
-        )
-        return output_signals
+        apply_distortion = self.apply_distortion
+        if self.torch_compile:
+            apply_distortion = compile_function(apply_distortion)
+        output_signals = apply_distortion(input_signals, basis_weights, self.use_tanh)
+        return output_signals.to(dtype)
 
     @staticmethod
     def apply_distortion(input_signals, basis_weights, use_tanh=False):
         max_order = basis_weights.shape[-1]
-        shape = input_signals.shape
-        b, _, _ = shape
-        device = input_signals.device
-
-        chebyshev = torch.zeros(max_order, *shape, device=device)
-        chebyshev[0] = torch.ones_like(input_signals)
-        chebyshev[1] = input_signals
-
-        for k in range(2, max_order):
-            chebyshev[k] = 2 * input_signals * chebyshev[k - 1] - chebyshev[k - 2]
+        basis_weights = basis_weights[:, :, None, None]
 
         if use_tanh:
-            chebyshev = torch.tanh(chebyshev)
-
-        chebyshev = chebyshev * basis_weights.T.view(max_order, b, 1, 1)
-        output_signals = chebyshev.sum(0)
+            # tanh breaks the clenshaw identity; run the recurrence with two running terms.
+            prev, curr = 1, input_signals
+            output_signals = math.tanh(1) * basis_weights[:, 0]
+            output_signals = output_signals + basis_weights[:, 1] * torch.tanh(curr)
+            for k in range(2, max_order):
+                prev, curr = curr, 2 * input_signals * curr - prev
+                output_signals = output_signals + basis_weights[:, k] * torch.tanh(curr)
+        else:
+            # clenshaw's algorithm; avoids stacking all chebyshev polynomials
+            b1, b2 = basis_weights[:, -1], 0
+            for k in range(max_order - 2, 0, -1):
+                b1, b2 = 2 * input_signals * b1 - b2 + basis_weights[:, k], b1
+            output_signals = input_signals * b1 - b2 + basis_weights[:, 0]
         return output_signals
 
     def parameter_size(self):
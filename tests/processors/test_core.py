@@ -1,3 +1,11 @@
+import pytest
+import torch
+from torchaudio.functional import lfilter
+
+import grafx.processors.core.iir as iir
+from grafx.processors.core.iir import IIRFilter
+
+
 def _hmm():
     import matplotlib.pyplot as plt
 
@@ -28,3 +36,71 @@ def _hmm():
         ax[i].plot(fb.sum(-1), label=scale)
     fig.set_size_inches(10, 20)
     fig.savefig("filterbanks.pdf", bbox_inches="tight")
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+def test_biquad_cascade_numba(dtype, batch_size=8, num_biquads=4, audio_len=2**14):
+    pytest.importorskip("numba")
+    from grafx.processors.core.biquad_numba import biquad_cascade
+
+    torch.manual_seed(0)
+    input_signal = 0.1 * torch.randn(batch_size, audio_len, dtype=dtype)
+    radius = 0.5 + 0.4 * torch.rand(batch_size, num_biquads, dtype=dtype)
+    angle = torch.pi * torch.rand(batch_size, num_biquads, dtype=dtype)
+    As = torch.stack(
+        [torch.ones_like(radius), -2 * radius * torch.cos(angle), radius.square()], -1
+    )
+    Bs = 0.2 * torch.randn(batch_size, num_biquads, 3, dtype=dtype)
+
+    with torch.no_grad():
+        expected_output_signal = input_signal
+        for i in range(num_biquads):
+            expected_output_signal = lfilter(
+                expected_output_signal,
+                b_coeffs=Bs[:, i, :],
+                a_coeffs=As[:, i, :],
+                batching=True,
+            )
+
+    output_signal = biquad_cascade(input_signal.numpy(), Bs.numpy(), As.numpy())
+    output_signal = torch.from_numpy(output_signal)
+    assert output_signal.dtype == dtype
+    atol = 1e-5 if dtype == torch.float32 else 1e-10
+    assert torch.allclose(output_signal, expected_output_signal, atol=atol)
+
+
+def test_iir_filter_numba_backend(monkeypatch, batch_size=4, num_biquads=3):
+    pytest.importorskip("numba")
+
+    calls = []
+    kernel = iir.biquad_cascade
+    monkeypatch.setattr(
+        iir, "biquad_cascade", lambda *args: calls.append(1) or kernel(*args)
+    )
+
+    torch.manual_seed(0)
+    input_signal = 0.1 * torch.randn(batch_size, 2, 2**14)
+    radius = 0.5 + 0.4 * torch.rand(batch_size, 2, num_biquads)
+    angle = torch.pi * torch.rand(batch_size, 2, num_biquads)
+    As = torch.stack(
+        [torch.ones_like(radius), -2 * radius * torch.cos(angle), radius.square()], -1
+    )
+    Bs = 0.2 * torch.randn(batch_size, 2, num_biquads, 3)
+
+    # opt-in only; the default lfilter backend always uses torchaudio
+    with torch.no_grad():
+        expected_output_signal = IIRFilter(backend="lfilter")(input_signal, Bs, As)
+    assert not calls
+
+    processor = IIRFilter(backend="lfilter", use_numba=True)
+    with torch.no_grad():
+        output_signal = processor(input_signal, Bs, As)
+    assert calls
+    assert output_signal.shape == input_signal.shape
+    assert torch.allclose(output_signal, expected_output_signal, atol=1e-5)
+
+    # with gradients recorded, the torchaudio path is used
+    calls.clear()
+    Bs.requires_grad_(True)
+    processor(input_signal, Bs, As).sum().backward()
+    assert not calls and Bs.grad is not None
@@ -1,8 +1,10 @@
 import pytest
+import torch
 from utils import _save_audio_and_mel, _test_single_processor, get_device_setup
 
 import tests.processors.conftest as conftest
 from grafx.processors import *
+from grafx.processors.core.midside import lr_to_ms, ms_to_lr
 
 # region Fixture
 
@@ -34,7 +36,7 @@ def processor_list():
     return []
 
 
-@pytest.fixture(params=[1])  # [-1, 0, 0.01, 1]
+@pytest.fixture(params=[1], scope="session")  # [-1, 0, 0.01, 1]
 def std(request):
     return request.param
 
@@ -283,6 +285,86 @@ def test_newzerophase_fir_equalizer_with_filterbank_all_scales(
     add_processor_if_unique(name, processor, processor_list)
 
 
+@pytest.mark.parametrize("window", ["hann", "hamming", "blackman"])
+def test_newzerophase_fir_equalizer_forward_freq(
+    num_frequency_bins, processor_channel, window, setup
+):
+    device, flashfftconv = get_device_setup(setup)
+
+    processor = NewZeroPhaseFIREqualizer(
+        num_frequency_bins=num_frequency_bins,
+        processor_channel=processor_channel,
+        flashfftconv=flashfftconv,
+        window=window,
+    ).to(device)
+    torch.manual_seed(0)
+    n_channels, n_bins = processor.parameter_size()["log_magnitude"]
+    log_magnitude = torch.randn(4, n_channels, n_bins, device=device)
+    input_signal = torch.randn(4, 2, 2**15, device=device)
+
+    output_fir = processor(input_signal, log_magnitude)
+    output_freq = processor.forward_freq(input_signal, log_magnitude)
+    assert output_freq.shape == output_fir.shape
+    error = (output_freq - output_fir).norm() / output_fir.norm()
+    assert error < 0.1
+
+
+def test_newzerophase_fir_equalizer_forward_freq_fallback(setup):
+    device, flashfftconv = get_device_setup(setup)
+
+    # the kaiser window has no spectral taps, so forward_freq falls back to forward
+    processor = NewZeroPhaseFIREqualizer(flashfftconv=flashfftconv, window="kaiser").to(
+        device
+    )
+    torch.manual_seed(0)
+    n_channels, n_bins = processor.parameter_size()["log_magnitude"]
+    log_magnitude = torch.randn(4, n_channels, n_bins, device=device)
+    input_signal = torch.randn(4, 2, 2**15, device=device)
+
+    output_fir = processor(input_signal, log_magnitude)
+    output_freq = processor.forward_freq(input_signal, log_magnitude)
+    assert torch.equal(output_freq, output_fir)
+
+
+def test_zerophase_fir_equalizer_forward_freq(num_frequency_bins, setup):
+    device, _ = get_device_setup(setup)
+
+    processor = ZeroPhaseFIREqualizer(num_magnitude_bins=num_frequency_bins).to(device)
+    torch.manual_seed(0)
+    log_magnitude = torch.randn(4, num_frequency_bins, device=device)
+    input_signal = torch.randn(4, 2, 2**15, device=device)
+
+    output_fir = processor(input_signal, log_magnitude)
+    output_freq = processor.forward_freq(input_signal, log_magnitude)
+    assert output_freq.shape == output_fir.shape
+    error = (output_freq - output_fir).norm() / output_fir.norm()
+    assert error < 0.1
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+def test_newzerophase_fir_equalizer_midside_dtype(dtype, setup):
+    device, flashfftconv = get_device_setup(setup)
+
+    processor = NewZeroPhaseFIREqualizer(
+        num_frequency_bins=256,
+        processor_channel="midside",
+        flashfftconv=flashfftconv,
+    ).to(device)
+    torch.manual_seed(0)
+    n_channels, n_bins = processor.parameter_size()["log_magnitude"]
+    log_magnitude = torch.randn(4, n_channels, n_bins, device=device, dtype=dtype)
+    input_signal = torch.randn(4, 2, 2**12, device=device, dtype=dtype)
+
+    fir = processor.fir(log_magnitude)
+    expected_output = ms_to_lr(
+        processor._process_mono_stereo(lr_to_ms(input_signal), fir)
+    )
+    output = processor(input_signal, log_magnitude)
+    assert output.dtype == dtype
+    assert torch.allclose(output, expected_output, atol=1e-5)
+    assert processor.forward_freq(input_signal, log_magnitude).dtype == dtype
+
+
 @pytest.mark.parametrize("num_filters", [10, 20])
 @pytest.mark.parametrize("use_shelving_filters", [True, False])
 def test_parametric_equalizer(
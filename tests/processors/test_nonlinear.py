@@ -1,4 +1,7 @@
+import pickle
+
 import pytest
+import torch
 from utils import _save_audio_and_mel, _test_single_processor
 
 import tests.processors.conftest as conftest
@@ -109,3 +112,130 @@ def test_chebyshev(
         use_tanh=use_tanh,
     ).to(device)
     _test_single_processor(processor, device=device)
+
+
+@pytest.mark.parametrize(
+    "processor_cls", [PiecewiseTanhDistortion, ChebyshevDistortion]
+)
+def test_torch_compile(processor_cls, device):
+    processor = processor_cls(torch_compile=True).to(device)
+    _test_single_processor(processor, device=device)
+
+    torch.manual_seed(0)
+    input_signals = torch.randn(4, 2, 2**12, device=device)
+    parameters = {
+        k: torch.randn(4, *((v,) if isinstance(v, int) else v), device=device)
+        for k, v in processor.parameter_size().items()
+    }
+    output_signals = processor(input_signals, **parameters)
+    expected_output_signals = processor_cls().to(device)(input_signals, **parameters)
+    assert torch.allclose(output_signals, expected_output_signals, atol=1e-5)
+
+    processor = pickle.loads(pickle.dumps(processor))
+    assert torch.allclose(processor(input_signals, **parameters), output_signals)
+
+
+@pytest.mark.parametrize(
+    "processor_cls",
+    [TanhDistortion, PiecewiseTanhDistortion, PowerDistortion, ChebyshevDistortion],
+)
+def test_compute_dtype(processor_cls, remove_dc, device):
+    processor = processor_cls(compute_dtype=torch.bfloat16, remove_dc=remove_dc)
+    processor = processor.to(device)
+    _test_single_processor(processor, device=device)
+
+    # a small ac part on top of a large dc offset
+    torch.manual_seed(0)
+    time = torch.arange(2**12, device=device)
+    input_signals = 1 + 0.01 * torch.sin(0.05 * time).expand(4, 2, -1)
+    parameters = {
+        k: torch.randn(4, *((v,) if isinstance(v, int) else v), device=device)
+        for k, v in processor.parameter_size().items()
+    }
+    output_signals = processor(input_signals, **parameters)
+    expected_output_signals = processor_cls(remove_dc=remove_dc).to(device)(
+        input_signals, **parameters
+    )
+    error = (output_signals - expected_output_signals).norm()
+    assert error / expected_output_signals.norm() < 0.02
+
+
+def test_piecewise_tanh_coefficient_cache(device):
+    processor = PiecewiseTanhDistortion().to(device).eval()
+    input_signals = torch.randn(2, 1, 2**10, device=device)
+    log_hardness = torch.randn(2, 2, device=device)
+    z_threshold = torch.randn(2, 2, device=device)
+    log_pre_gain = torch.randn(2, 1, device=device)
+
+    output_signals = processor(input_signals, log_hardness, z_threshold, log_pre_gain)
+    coefficients = processor.get_coefficients(log_hardness, z_threshold)
+    assert processor.get_coefficients(log_hardness, z_threshold) is coefficients
+
+    log_hardness.add_(1.0)
+    cached_output_signals = processor(
+        input_signals, log_hardness, z_threshold, log_pre_gain
+    )
+    assert processor.get_coefficients(log_hardness, z_threshold) is not coefficients
+    expected_output_signals = processor.train()(
+        input_signals, log_hardness, z_threshold, log_pre_gain
+    )
+    assert torch.allclose(cached_output_signals, expected_output_signals)
+    assert not torch.allclose(output_signals, expected_output_signals)
+
+
+@pytest.mark.parametrize("training", [True, False])
+def test_piecewise_tanh_inference_mode(training, device):
+    processor = PiecewiseTanhDistortion().to(device).train(training)
+    with torch.inference_mode():
+        input_signals = torch.randn(2, 1, 2**10, device=device)
+        log_hardness = torch.randn(2, 2, device=device)
+        z_threshold = torch.randn(2, 2, device=device)
+        log_pre_gain = torch.randn(2, 1, device=device)
+        processor(input_signals, log_hardness, z_threshold, log_pre_gain)
+    assert processor._cached_coefficients is None
+
+
+def test_piecewise_tanh_coefficient_cache_no_grad(device):
+    processor = PiecewiseTanhDistortion().to(device).eval()
+    input_signals = torch.randn(2, 1, 2**10, device=device)
+    log_hardness = torch.nn.Parameter(torch.randn(2, 2, device=device))
+    z_threshold = torch.nn.Parameter(torch.randn(2, 2, device=device))
+    log_pre_gain = torch.randn(2, 1, device=device)
+
+    with torch.no_grad():
+        processor(input_signals, log_hardness, z_threshold, log_pre_gain)
+        coefficients = processor.get_coefficients(log_hardness, z_threshold)
+        assert coefficients is processor._cached_coefficients[1]
+        assert processor.get_coefficients(log_hardness, z_threshold) is coefficients
+
+    output_signals = processor(input_signals, log_hardness, z_threshold, log_pre_gain)
+    assert output_signals.requires_grad
+
+
+def test_power_load_legacy_state_dict():
+    # checkpoints saved before horner's method carry an "arange" buffer
+    legacy_state_dict = {"arange": torch.arange(10)[:, None, None, None]}
+    processor = PowerDistortion(max_order=10)
+    processor.load_state_dict(legacy_state_dict)
+
+    container = torch.nn.ModuleDict({"power": PowerDistortion(max_order=10)})
+    container.load_state_dict({"power.arange": legacy_state_dict["arange"]})
+
+
+def test_piecewise_tanh_slope_continuity():
+    # the outer segments are scaled so that the slope is continuous at k_p and -k_n
+    torch.manual_seed(0)
+    log_hardness = torch.randn(4, 2, dtype=torch.float64)
+    z_threshold = torch.randn(4, 2, dtype=torch.float64)
+    coefficients = PiecewiseTanhDistortion.compute_coefficients(
+        torch.exp(log_hardness), torch.sigmoid(z_threshold)
+    )
+    kp, kn = coefficients[:2]
+
+    eps = 1e-6
+    for knee in [kp, -kn]:
+        points = knee + eps * torch.tensor([-1.0, 0.0, 1.0], dtype=torch.float64)
+        output = PiecewiseTanhDistortion.apply_distortion(points, *coefficients)
+        left_slope = (output[..., 1] - output[..., 0]) / eps
+        right_slope = (output[..., 2] - output[..., 1]) / eps
+        assert torch.allclose(left_slope, right_slope, atol=1e-4)